@@ -1,10 +1,11 @@
 import json
+import math
 import os
-import re
-import sqlite3
+import random
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from urllib.parse import urlencode, quote
+from urllib.parse import quote
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError, URLError
 from zoneinfo import ZoneInfo
@@ -12,6 +13,8 @@ from zoneinfo import ZoneInfo
 import pandas as pd
 import streamlit as st
 
+import arcade_core as core
+
 # ============================
 # Arcade Game Picker
 # v1.8-ui • Arcade Retro aesthetic + Game Cards + Cleaner Details
@@ -222,11 +225,6 @@ h3 { font-family: 'Orbitron', monospace !important; color: var(--arcade-text) !i
 # ----------------------------
 TZ = ZoneInfo("America/New_York")
 
-CSV_PATH = "arcade_games_1978_2008_clean.csv"
-DB_PATH = "game_state.db"
-
-R2_PUBLIC_ROOT = "https://pub-04cb80aef9834a5d908ddf7538b7fffa.r2.dev"
-
 APP_VERSION = (
     "1.8-ui • Arcade Retro aesthetic + Game Cards + Cleaner Details • "
     "Marquees (R2 root), Don't have ROM, Not playable, Want export • "
@@ -289,72 +287,6 @@ st.caption(
     "Cabinet-first discovery · find games you can actually play at home · 1978–2008"
 )
 
-# ----------------------------
-# Cabinet profile + strict compatibility
-# ----------------------------
-CABINET_SUMMARY = (
-    "Your cabinet: 4-way stick + 8-way stick, 6 buttons/player, NO spinner/trackball/lightgun/wheel, "
-    "horizontal monitor (vertical OK)."
-)
-
-BLOCKED_GENRE_EXACT = {
-    "trackball", "dial/paddle", "dial", "paddle",
-    "lightgun shooter", "gambling", "casino", "quiz",
-}
-BLOCKED_GENRE_CONTAINS = ["driving", "racing", "pinball", "redemption"]
-BLOCKED_TITLE_HINTS = [
-    "lightgun", "light gun", "trackball", "spinner",
-    "steering", "wheel", "pedal", "paddle",
-]
-
-# ----------------------------
-# Helpers
-# ----------------------------
-def normalize_str(x) -> str:
-    if pd.isna(x):
-        return ""
-    return str(x).strip()
-
-def ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
-    for col in ["rom", "game", "year", "company", "genre", "platform"]:
-        if col not in df.columns:
-            df[col] = ""
-    df["rom"]      = df["rom"].map(normalize_str).str.lower()
-    df["game"]     = df["game"].map(normalize_str)
-    df["company"]  = df["company"].map(normalize_str)
-    df["genre"]    = df["genre"].map(normalize_str)
-    df["platform"] = df["platform"].map(normalize_str)
-    df["year"]     = pd.to_numeric(df["year"], errors="coerce")
-    df = df.dropna(subset=["game", "year"]).copy()
-    df["year"]     = df["year"].astype(int)
-    df["_game_l"]     = df["game"].astype(str).str.lower()
-    df["_genre_l"]    = df["genre"].astype(str).str.lower()
-    df["_platform_l"] = df["platform"].astype(str).str.lower()
-    df["_company_l"]  = df["company"].astype(str).str.lower()
-    return df
-
-def load_games_no_cache() -> pd.DataFrame:
-    df = pd.read_csv(CSV_PATH)
-    return ensure_columns(df)
-
-def is_cabinet_compatible_strict(row: pd.Series) -> bool:
-    genre    = normalize_str(row.get("genre", "")).strip().lower()
-    title    = normalize_str(row.get("game", "")).strip().lower()
-    platform = normalize_str(row.get("platform", "")).strip().lower()
-    if not genre and not title:
-        return False
-    if genre in BLOCKED_GENRE_EXACT:
-        return False
-    for frag in BLOCKED_GENRE_CONTAINS:
-        if frag in genre:
-            return False
-    if any(x in platform for x in ("gambling", "casino", "slot", "quiz")):
-        return False
-    for hint in BLOCKED_TITLE_HINTS:
-        if hint in title:
-            return False
-    return True
-
 # ----------------------------
 # Supabase
 # ----------------------------
@@ -391,7 +323,7 @@ def supabase_get_all_statuses(table: str = "game_status") -> dict[str, str]:
     url = f"{_sb_base()}/rest/v1/{table}?select=rom,status"
     req = Request(url, headers=_sb_headers(), method="GET")
     with urlopen(req, timeout=15) as resp:
-        data = json.loads(resp.read().decode("utf-8", errors="replace"))
+        data = json.load(resp)
     out: dict[str, str] = {}
     if isinstance(data, list):
         for row in data:
@@ -421,11 +353,8 @@ def supabase_set_status(rom: str, status: str | None, table: str = "game_status"
 # ----------------------------
 # SQLite fallback
 # ----------------------------
-def get_db() -> sqlite3.Connection:
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
-
 def init_sqlite_db() -> None:
-    conn = get_db()
+    conn = core.get_db()
     conn.execute("""
         CREATE TABLE IF NOT EXISTS game_status (
             rom TEXT PRIMARY KEY,
@@ -444,21 +373,18 @@ def init_sqlite_db() -> None:
     conn.close()
 
 def sqlite_get_all_statuses() -> dict[str, str]:
-    conn = get_db()
-    cur = conn.execute("SELECT rom, status FROM game_status")
-    rows = cur.fetchall()
+    # Every writer strips and lowercases rom before inserting, so rows map straight to the cache
+    conn = core.get_db()
+    cur = conn.execute("SELECT rom, status FROM game_status WHERE rom != ''")
+    out = dict(cur.fetchall())
     conn.close()
-    out = {}
-    for rom, status in rows:
-        if rom:
-            out[str(rom).strip().lower()] = status
     return out
 
 def sqlite_set_status(rom: str, status: str | None) -> None:
     rom = (rom or "").strip().lower()
     if not rom:
         return
-    conn = get_db()
+    conn = core.get_db()
     if status is None:
         conn.execute("DELETE FROM game_status WHERE rom=?", (rom,))
     else:
@@ -474,7 +400,7 @@ def sqlite_get_history(history_key: str) -> str | None:
     history_key = (history_key or "").strip().lower()
     if not history_key:
         return None
-    conn = get_db()
+    conn = core.get_db()
     cur = conn.execute("SELECT history_md FROM game_history WHERE history_key=?", (history_key,))
     row = cur.fetchone()
     conn.close()
@@ -488,7 +414,7 @@ def sqlite_set_history(history_key: str, history_md: str) -> None:
     history_md  = (history_md or "").strip()
     if not history_key or not history_md:
         return
-    conn = get_db()
+    conn = core.get_db()
     conn.execute("""
         INSERT INTO game_history (history_key, history_md, updated_at)
         VALUES (?, ?, datetime('now'))
@@ -501,7 +427,7 @@ def sqlite_delete_history(history_key: str) -> None:
     history_key = (history_key or "").strip().lower()
     if not history_key:
         return
-    conn = get_db()
+    conn = core.get_db()
     conn.execute("DELETE FROM game_history WHERE history_key=?", (history_key,))
     conn.commit()
     conn.close()
@@ -628,11 +554,11 @@ def init_state():
         "picked_rows": [],
         "selected_key": None,
         "adb_cache": {},
+        "adb_loaded": {},
         "status_cache": {},
         "status_cache_loaded": False,
         "history_cache": {},
         "history_error_cache": {},
-        "marquee_bytes_cache": {},
         "marquee_exists_cache": {},
     }
     for k, v in defaults.items():
@@ -660,43 +586,20 @@ def update_status(rom: str, new_status: str | None):
     else:
         st.session_state.status_cache[rom] = new_status
 
-# ----------------------------
-# Links
-# ----------------------------
-def build_links(game_name: str):
-    q = game_name.replace(" ", "+")
-    return {
-        "Gameplay (YouTube)":        f"https://www.youtube.com/results?search_query={q}+arcade+gameplay",
-        "History / Legacy (search)": f"https://www.google.com/search?q={q}+arcade+history+legacy",
-        "Controls / Moves (search)": f"https://www.google.com/search?q={q}+arcade+controls+buttons",
-        "Manual / Instructions":     f"https://www.google.com/search?q={q}+arcade+manual+instructions",
-        "Ports / Collections":       f"https://www.google.com/search?q={q}+arcade+collection+port",
-    }
-
-def game_key(row: pd.Series) -> str:
-    rom = normalize_str(row.get("rom", "")).lower()
-    if rom:
-        return f"rom:{rom}"
-    return (
-        f"meta:{normalize_str(row.get('game',''))}|"
-        f"{int(row.get('year',0))}|"
-        f"{normalize_str(row.get('company',''))}"
-    )
-
 # ----------------------------
 # Export
 # ----------------------------
-def build_want_to_play_txt(df: pd.DataFrame) -> str:
-    want_roms = {rom for rom, status in st.session_state.status_cache.items() if status == STATUS_WANT}
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_want_to_play_txt(csv_mtime: float, want_roms: tuple[str, ...]) -> str:
+    # Keyed on the sorted Want ROMs, so reruns that don't change the list reuse the text
     if not want_roms:
         return "No games marked as Want to Play."
-    subset = df[df["rom"].isin(want_roms)].copy().sort_values(["year", "game"])
-    lines: list[str] = []
-    for _, row in subset.iterrows():
-        lines.append(
-            f"{row.get('game','')} ({row.get('year','')}) — "
-            f"{row.get('company','')} — {row.get('genre','')} — ROM: {row.get('rom','')}"
-        )
+    df = core.load_games(core.CSV_PATH, csv_mtime)
+    subset = df[df["rom"].isin(want_roms)]
+    lines = (
+        subset["game"] + " (" + subset["year"].astype(str) + ") — " +
+        subset["company"].astype("string") + " — " + subset["genre"].astype("string") + " — ROM: " + subset["rom"]
+    )
     return "\n".join(lines)
 
 # ----------------------------
@@ -708,113 +611,22 @@ def _st_image(data, *, caption: str | None = None):
     except TypeError:
         st.image(data, caption=caption, use_column_width=True)
 
-def marquee_url(rom: str) -> str:
-    rom = (rom or "").strip().lower()
-    if not rom:
-        return f"{R2_PUBLIC_ROOT}/default.png"
-    return f"{R2_PUBLIC_ROOT}/{rom}.png"
-
-def default_marquee_url() -> str:
-    return f"{R2_PUBLIC_ROOT}/default.png"
-
-def fetch_image_bytes(url: str, timeout_sec: int = 10) -> bytes | None:
-    cache: dict = st.session_state.marquee_bytes_cache
-    if url in cache:
-        return cache[url]
-    try:
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0 (ArcadeGamePicker)"}, method="GET")
-        with urlopen(req, timeout=timeout_sec) as resp:
-            b = resp.read()
-        cache[url] = b
-        return b
-    except Exception:
-        cache[url] = None
-        return None
-
 def show_marquee(rom: str, enabled: bool = True):
     if not enabled:
         return
-    rom = (rom or "").strip().lower()
-    if rom:
-        b = fetch_image_bytes(marquee_url(rom), timeout_sec=10)
-        if b:
-            _st_image(b)
-            return
-    b2 = fetch_image_bytes(default_marquee_url(), timeout_sec=10)
-    if b2:
-        _st_image(b2)
+    src = core.marquee_src(rom, timeout_sec=10)
+    if src:
+        _st_image(src)
 
 # ----------------------------
 # ADB integration
 # ----------------------------
-def adb_urls(rom: str):
-    rom = (rom or "").strip().lower()
-    params = {"ajax": "query_mame", "lang": "en", "game_name": rom}
-    return {
-        "page_https":    f"https://adb.arcadeitalia.net/?mame={rom}",
-        "page_http":     f"http://adb.arcadeitalia.net/?mame={rom}",
-        "scraper_https": "https://adb.arcadeitalia.net/service_scraper.php?" + urlencode(params),
-        "scraper_http":  "http://adb.arcadeitalia.net/service_scraper.php?" + urlencode(params),
-    }
-
-def fetch_json_url(url: str, timeout_sec: int = 12) -> dict:
-    req = Request(url, headers={
-        "User-Agent": "Mozilla/5.0 (ArcadeGamePicker; +https://streamlit.app)",
-        "Accept": "application/json,text/plain,*/*",
-    }, method="GET")
-    with urlopen(req, timeout=timeout_sec) as resp:
-        raw = resp.read()
-    data = json.loads(raw.decode("utf-8", errors="replace").strip())
-    return data if isinstance(data, dict) else {"_data": data}
-
-def fetch_adb_details(rom: str) -> dict:
-    rom = (rom or "").strip().lower()
-    if not rom:
-        return {"_error": "No ROM short name available for this game."}
-    if rom in st.session_state.adb_cache:
-        return st.session_state.adb_cache[rom]
-    urls = adb_urls(rom)
-    last_err = None
-    for u in (urls["scraper_https"], urls["scraper_http"]):
-        try:
-            data = fetch_json_url(u, timeout_sec=12)
-            st.session_state.adb_cache[rom] = data
-            return data
-        except Exception as e:
-            last_err = str(e)
-    out = {
-        "_error": "Could not retrieve data from ADB right now.",
-        "_detail": last_err or "Unknown error",
-        "_rom": rom,
-        "_fallback_page": urls["page_http"],
-    }
-    st.session_state.adb_cache[rom] = out
-    return out
-
-def extract_image_urls(obj) -> list[str]:
-    urls: list[str] = []
-    def walk(x):
-        if isinstance(x, dict):
-            for v in x.values(): walk(v)
-        elif isinstance(x, list):
-            for v in x: walk(v)
-        elif isinstance(x, str):
-            s = x.strip()
-            if (s.startswith("http://") or s.startswith("https://")) and re.search(r"\.(png|jpg|jpeg|webp)(\?.*)?$", s, re.IGNORECASE):
-                urls.append(s)
-    walk(obj)
-    seen = set(); out: list[str] = []
-    for u in urls:
-        if u not in seen:
-            seen.add(u); out.append(u)
-    return out
-
 def show_adb_block(rom: str):
     rom = (rom or "").strip().lower()
     if not rom:
         st.info("ADB details require a ROM short name; this entry has none.")
         return None
-    urls = adb_urls(rom)
+    urls = core.adb_urls(rom)
     st.markdown(f"**ADB:** [HTTP]({urls['page_http']}) · [HTTPS]({urls['page_https']})")
 
     c1, c2, c3 = st.columns([1, 1, 2])
@@ -825,17 +637,18 @@ def show_adb_block(rom: str):
     with c3:
         show_images = st.toggle("Show artwork", value=True, key=f"adb_img_{rom}")
 
-    if refresh_btn and rom in st.session_state.adb_cache:
-        del st.session_state.adb_cache[rom]
+    if refresh_btn:
+        core.forget_adb_details(rom)
 
     if not load_btn and not refresh_btn:
-        if rom in st.session_state.adb_cache and not st.session_state.adb_cache[rom].get("_error"):
-            data = st.session_state.adb_cache[rom]
-        else:
+        # Prefetches keep the shared store warm, but details only show once loaded in this session
+        data = core.cached_adb_details(rom) if st.session_state.adb_loaded.get(rom) else None
+        if data is None or data.get("_error"):
             return None
     else:
+        st.session_state.adb_loaded[rom] = True
         with st.spinner("Fetching from ADB..."):
-            data = fetch_adb_details(rom)
+            data = core.fetch_adb_details(rom)
 
     if isinstance(data, dict) and data.get("_error"):
         st.error(data["_error"])
@@ -854,7 +667,7 @@ def show_adb_block(rom: str):
                 st.write(f"**{k}:** {val}")
 
     if show_images:
-        imgs = extract_image_urls(data)
+        imgs = core.extract_image_urls(data)
         if imgs:
             st.markdown("#### Artwork")
             for u in imgs[:10]:
@@ -874,12 +687,12 @@ def status_badge_html(status: str | None) -> str:
 # Details panel (redesigned)
 # ----------------------------
 def show_game_details(row: pd.Series, *, show_marquees: bool):
-    g        = normalize_str(row.get("game", ""))
-    y        = int(row.get("year", 0))
-    c        = normalize_str(row.get("company", ""))
-    genre    = normalize_str(row.get("genre", ""))
-    platform = normalize_str(row.get("platform", ""))
-    rom      = normalize_str(row.get("rom", "")).lower()
+    g        = row["game"]
+    y        = int(row["year"])
+    c        = row["company"]
+    genre    = row["genre"]
+    platform = row["platform"]
+    rom      = row["rom"]
 
     # Marquee
     show_marquee(rom, enabled=show_marquees)
@@ -937,16 +750,15 @@ def show_game_details(row: pd.Series, *, show_marquees: bool):
     # History Mode
     with st.expander("🧠 History Mode", expanded=False):
         history_key = (rom or f"{g}|{y}|{c}").strip().lower()
-        history_safe_key = re.sub(r"[^a-z0-9_:-]+", "_", history_key)
+        history_safe_key = core.short_key(history_key)
+        # Only hits are cached; a miss is re-read so a profile generated elsewhere shows up
         existing_history = st.session_state.history_cache.get(history_key)
+        if existing_history is None:
+            existing_history = sqlite_get_history(history_key)
+            if existing_history is not None:
+                st.session_state.history_cache[history_key] = existing_history
         existing_error   = st.session_state.history_error_cache.get(history_key)
 
-        if not existing_history:
-            db_history = sqlite_get_history(history_key)
-            if db_history:
-                existing_history = db_history
-                st.session_state.history_cache[history_key] = db_history
-
         st.caption("Generate a historical profile with OpenAI. Cached locally in SQLite.")
 
         h1, h2, h3 = st.columns([1, 1, 1])
@@ -993,7 +805,7 @@ def show_game_details(row: pd.Series, *, show_marquees: bool):
         show_adb_block(rom)
 
     with st.expander("🔗 Research links", expanded=False):
-        for name, url in build_links(g).items():
+        for name, url in core.build_links(g):
             st.write(f"- [{name}]({url})")
 
 # ----------------------------
@@ -1001,12 +813,14 @@ def show_game_details(row: pd.Series, *, show_marquees: bool):
 # ----------------------------
 init_state()
 init_sqlite_db()
+core.init_core_db()
 load_status_cache_once()
 
 try:
-    df = load_games_no_cache()
+    csv_mtime = Path(core.CSV_PATH).stat().st_mtime
+    df = core.load_games(core.CSV_PATH, csv_mtime)
 except FileNotFoundError:
-    st.error(f"Could not find `{CSV_PATH}` in the repo root. Upload it to GitHub and redeploy.")
+    st.error(f"Could not find `{core.CSV_PATH}` in the repo root. Upload it to GitHub and redeploy.")
     st.stop()
 except Exception as e:
     st.error("Failed to load CSV.")
@@ -1032,10 +846,13 @@ st.sidebar.divider()
 show_marquees = st.sidebar.toggle("Show marquees", value=True)
 
 st.sidebar.divider()
-want_count = sum(1 for s in st.session_state.status_cache.values() if s == STATUS_WANT)
+status_counts = Counter(st.session_state.status_cache.values())
+want_count    = status_counts[STATUS_WANT]
 st.sidebar.download_button(
     label=f"📤 Export Want to Play ({want_count})",
-    data=build_want_to_play_txt(df),
+    data=build_want_to_play_txt(
+        csv_mtime, tuple(sorted(rom for rom, status in st.session_state.status_cache.items() if status == STATUS_WANT))
+    ),
     file_name="arcade_want_to_play.txt",
     mime="text/plain",
     use_container_width=True,
@@ -1045,64 +862,52 @@ st.sidebar.divider()
 search_name = st.sidebar.text_input("Search (name or ROM)", "")
 
 with st.sidebar.expander("Advanced filters", expanded=False):
-    years = st.slider("Year range", 1978, 2008, (1978, 2008))
-    platforms = sorted(df["platform"].replace("", pd.NA).dropna().unique().tolist())
-    genres    = sorted(df["genre"].replace("", pd.NA).dropna().unique().tolist())
+    platforms, genres, (year_lo, year_hi) = core.game_facets(csv_mtime)
+    years = st.slider("Year range", year_lo, year_hi, (year_lo, year_hi))
     platform_choice = st.multiselect("Platform (optional)", platforms)
     genre_choice    = st.multiselect("Genre (optional)", genres)
 
 # ----------------------------
 # Filtering
 # ----------------------------
-base = df[(df["year"] >= years[0]) & (df["year"] <= years[1])].copy()
-if platform_choice:
-    base = base[base["platform"].isin(platform_choice)]
-if genre_choice:
-    base = base[base["genre"].isin(genre_choice)]
-if strict_mode:
-    base = base[base.apply(is_cabinet_compatible_strict, axis=1)]
-
-def keep_by_status(row: pd.Series) -> bool:
-    rom = normalize_str(row.get("rom", "")).lower()
-    s   = status_for_rom(rom)
-    if only_played:
-        return s == STATUS_PLAYED
-    if only_want:
-        return s == STATUS_WANT
-    if hide_played and s == STATUS_PLAYED:
-        return False
-    if (not show_no_rom) and s == STATUS_NO_ROM:
-        return False
-    if (not show_not_playable) and s == STATUS_NOT_PLAYABLE:
-        return False
-    return True
-
-base = base[base.apply(keep_by_status, axis=1)].copy()
-base = base.sort_values(["year", "game"]).reset_index(drop=True)
+base = core.filter_games(csv_mtime, tuple(years), tuple(platform_choice), tuple(genre_choice), strict_mode)
+
+# Status filters: one dict lookup per row, then plain Boolean masks
+status = base["rom"].map(st.session_state.status_cache)
+if only_played:
+    keep = status.eq(STATUS_PLAYED)
+elif only_want:
+    keep = status.eq(STATUS_WANT)
+else:
+    keep = pd.Series(True, index=base.index)
+    if hide_played:
+        keep &= status.ne(STATUS_PLAYED)
+    if not show_no_rom:
+        keep &= status.ne(STATUS_NO_ROM)
+    if not show_not_playable:
+        keep &= status.ne(STATUS_NOT_PLAYABLE)
+
+base = base[keep].reset_index(drop=True)
 
 if search_name.strip():
     s = search_name.strip().lower()
-    hits = base[
-        base["_game_l"].str.contains(s, na=False)
-        | base["rom"].astype(str).str.lower().str.contains(s, na=False)
-    ].copy()
+    hits = base[base["_search_l"].str.contains(s, regex=False, na=False)]
 else:
-    hits = base.copy()
+    hits = base
 
 # ----------------------------
 # Stats bar (top of main area)
 # ----------------------------
 total_games   = len(df)
 total_visible = len(hits)
-played_count  = sum(1 for s in st.session_state.status_cache.values() if s == STATUS_PLAYED)
-want_count_v  = sum(1 for s in st.session_state.status_cache.values() if s == STATUS_WANT)
+played_count  = status_counts[STATUS_PLAYED]
 
 st.markdown(f"""
 <div class="stats-bar">
   <div class="stat-item"><span class="stat-num">{total_games:,}</span><span class="stat-label">Total</span></div>
   <div class="stat-item"><span class="stat-num">{total_visible:,}</span><span class="stat-label">Showing</span></div>
   <div class="stat-item"><span class="stat-num">{played_count}</span><span class="stat-label">Played</span></div>
-  <div class="stat-item"><span class="stat-num">{want_count_v}</span><span class="stat-label">Want</span></div>
+  <div class="stat-item"><span class="stat-num">{want_count}</span><span class="stat-label">Want</span></div>
 </div>
 """, unsafe_allow_html=True)
 
@@ -1128,11 +933,12 @@ with left:
     # Game of the Day
     st.markdown("#### 📆 Game of the Day")
     now  = datetime.now(TZ)
-    seed = int(now.strftime("%Y")) * 1000 + int(now.strftime("%j"))
+    seed = now.year * 1000 + now.timetuple().tm_yday
 
-    if len(hits) > 0:
-        gotd = hits.iloc[seed % len(hits)]
-        gotd_status = status_for_rom(normalize_str(gotd.get("rom", "")).lower())
+    # Drawn from the filtered catalog before the name/ROM search, so typing doesn't change it
+    if len(base) > 0:
+        gotd = base.iloc[seed % len(base)]
+        gotd_status = status_for_rom(gotd["rom"])
         bcls, blbl = STATUS_BADGE_CLASS.get(gotd_status, ("badge badge-none", "—"))
         st.markdown(
             f'<div class="game-card">'
@@ -1145,7 +951,7 @@ with left:
             unsafe_allow_html=True,
         )
         if st.button("▶ Open Game of the Day", use_container_width=True):
-            st.session_state.selected_key = game_key(gotd)
+            st.session_state.selected_key = gotd["_key"]
             st.rerun()
     else:
         st.caption("No Game of the Day with current filters.")
@@ -1154,8 +960,8 @@ with left:
         if len(hits) == 0:
             st.warning("No games match your current filters. Widen filters.")
         else:
-            row = hits.sample(1).iloc[0]
-            st.session_state.selected_key = game_key(row)
+            row = hits.iloc[random.randrange(len(hits))]
+            st.session_state.selected_key = row["_key"]
             st.rerun()
 
     st.divider()
@@ -1178,9 +984,12 @@ with left:
                 st.warning("No games match your current filters.")
             else:
                 n = min(10, len(hits))
-                sample = hits.sample(n).copy()
+                sample = hits.sample(n)
                 st.session_state.picked_rows = sample.to_dict("records")
-                st.session_state.selected_key = game_key(pd.Series(st.session_state.picked_rows[0]))
+                core.prefetch_adb_details([r["rom"] for r in st.session_state.picked_rows])
+                if show_marquees:
+                    core.prefetch_marquees([r["rom"] for r in st.session_state.picked_rows])
+                st.session_state.selected_key = st.session_state.picked_rows[0]["_key"]
                 st.rerun()
 
         # ── Game Cards browse list ──
@@ -1194,22 +1003,27 @@ with left:
 
         if inline_search.strip():
             sq = inline_search.strip().lower()
-            browse_hits = hits[
-                hits["_game_l"].str.contains(sq, na=False)
-                | hits["rom"].astype(str).str.lower().str.contains(sq, na=False)
-            ].copy()
+            browse_hits = hits[hits["_search_l"].str.contains(sq, regex=False, na=False)]
         else:
-            browse_hits = hits.copy()
+            browse_hits = hits
 
+        # Cards render one page at a time so each rerun sends at most card_limit of them
         card_limit = 20
-        card_rows  = browse_hits.head(card_limit)
+        card_pages = max(1, math.ceil(len(browse_hits) / card_limit))
+        card_page  = 1
+        if card_pages > 1:
+            card_page = st.number_input(
+                f"Page (of {card_pages:,})", min_value=1, max_value=card_pages, value=1, step=1,
+                key="browse_page",
+            )
+        card_start = (card_page - 1) * card_limit
+        card_rows  = browse_hits.iloc[card_start:card_start + card_limit]
 
         if len(browse_hits) == 0:
             st.info("No results. Try a different search term or adjust filters.")
         else:
             for _, row in card_rows.iterrows():
-                rom_val  = normalize_str(row.get("rom", "")).lower()
-                s        = status_for_rom(rom_val)
+                s        = status_for_rom(row["rom"])
                 bcls, blbl = STATUS_BADGE_CLASS.get(s, ("badge badge-none", "—"))
                 genre_v  = row.get("genre", "")
                 card_html = (
@@ -1223,39 +1037,37 @@ with left:
                     f'</div></div>'
                 )
                 st.markdown(card_html, unsafe_allow_html=True)
-                if st.button("▶ Open", key=f"card_open_{rom_val}_{int(row['year'])}", use_container_width=False):
-                    st.session_state.selected_key = game_key(row)
+                if st.button("▶ Open", key=f"card_open_{core.short_key(row['_key'])}", use_container_width=False):
+                    st.session_state.selected_key = row["_key"]
                     st.rerun()
 
-            if len(browse_hits) > card_limit:
-                st.caption(f"Showing {card_limit} of {len(browse_hits):,} — type above to narrow down.")
+            if card_pages > 1:
+                st.caption(
+                    f"Showing {card_start + 1:,}–{card_start + len(card_rows):,} of {len(browse_hits):,} "
+                    f"— page through or type above to narrow down."
+                )
 
         # Selectbox for full list
         st.markdown("##### Or select from full list")
-        view = hits[["rom", "game", "year", "company", "genre", "platform"]].copy()
-        view["status"] = view["rom"].apply(lambda r: STATUS_LABELS.get(status_for_rom(str(r).lower()), "—"))
+        view = hits
         if len(view) > 0:
-            labels = (
-                view["game"].astype(str) + " — " +
-                view["year"].astype(str) + " — " +
-                view["company"].astype(str) + " — " +
-                view["status"].astype(str)
+            labels, roms = view["_label"], view["rom"]
+            status_cache = st.session_state.status_cache
+            sel_pos = st.selectbox(
+                "Pick from results", range(len(view)),
+                format_func=lambda i: f"{labels.iat[i]} — {STATUS_LABELS.get(status_cache.get(roms.iat[i]), '—')}",
+                key="browse_select",
             )
-            selected_label = st.selectbox("Pick from results", labels, key="browse_select")
-            idx = labels[labels == selected_label].index[0]
-            selected_row = view.loc[idx]
+            selected_row = view.iloc[sel_pos]
             if st.button("➡️ Open selected", use_container_width=True):
-                st.session_state.selected_key = game_key(selected_row)
+                st.session_state.selected_key = selected_row["_key"]
                 st.rerun()
 
         # 10 picks
         if st.session_state.picked_rows:
             st.markdown("##### 🎯 Your 10 Picks")
-            pick_df = pd.DataFrame(st.session_state.picked_rows)
-            pick_df = pick_df[["rom", "game", "year", "company", "genre", "platform"]].copy()
-            for i, r in pick_df.iterrows():
-                rom_v    = normalize_str(r.get("rom", "")).lower()
-                s        = status_for_rom(rom_v)
+            for i, r in enumerate(st.session_state.picked_rows):
+                s        = status_for_rom(r["rom"])
                 bcls, blbl = STATUS_BADGE_CLASS.get(s, ("badge badge-none", "—"))
                 card_html = (
                     f'<div class="game-card">'
@@ -1267,7 +1079,7 @@ with left:
                 )
                 st.markdown(card_html, unsafe_allow_html=True)
                 if st.button("▶ Open", key=f"pick_{i}", use_container_width=False):
-                    st.session_state.selected_key = game_key(r)
+                    st.session_state.selected_key = r["_key"]
                     st.rerun()
 
 with right:
@@ -1282,23 +1094,8 @@ with right:
         </div>
         """, unsafe_allow_html=True)
     else:
-        key = st.session_state.selected_key
-        if key.startswith("rom:"):
-            rom = key.split("rom:", 1)[1]
-            match = df[df["rom"] == rom]
-            if len(match) == 0:
-                st.warning("Selected game not found in dataset.")
-            else:
-                show_game_details(match.iloc[0], show_marquees=show_marquees)
+        pos = core.game_index(csv_mtime).get(st.session_state.selected_key)
+        if pos is None:
+            st.warning("Selected game not found in dataset.")
         else:
-            try:
-                _, meta = key.split("meta:", 1)
-                title, year_str, company = meta.split("|", 2)
-                year  = int(year_str)
-                match = df[(df["game"] == title) & (df["year"] == year) & (df["company"] == company)]
-                if len(match) == 0:
-                    st.warning("Selected game not found in dataset.")
-                else:
-                    show_game_details(match.iloc[0], show_marquees=show_marquees)
-            except Exception:
-                st.warning("Could not resolve selection key.")
+            show_game_details(df.iloc[pos], show_marquees=show_marquees)
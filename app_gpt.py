@@ -1,7 +1,6 @@
 import json
 import os
-import re
-import sqlite3
+import random
 from datetime import datetime
 from pathlib import Path
 from urllib.error import HTTPError, URLError
@@ -12,6 +11,8 @@ from zoneinfo import ZoneInfo
 import pandas as pd
 import streamlit as st
 
+import arcade_core as core
+
 # ----------------------------
 # Page config
 # ----------------------------
@@ -20,7 +21,7 @@ st.set_page_config(page_title="Arcade Game Picker", layout="wide")
 st.title("🕹️ Arcade Game Picker (1978–2008)")
 st.caption(
     "Cabinet-first discovery: find games you can actually play at home, learn the history, and see artwork. "
-    "CSV caching is disabled so data updates apply immediately. ADB details/artwork load on-demand. "
+    "The CSV is cached per file version, so data updates still apply immediately. ADB details/artwork load on-demand. "
     "Status and notes use Supabase first when configured, with SQLite fallback."
 )
 
@@ -28,11 +29,7 @@ st.caption(
 # Constants
 # ----------------------------
 TZ = ZoneInfo("America/New_York")
-APP_VERSION = "1.7.4 • Restored No ROM / Not Playable flags + filters • Notes moved to Supabase-first • Marquee fallback restored • Collapsible research links • Collapsible ADB • Strict Cabinet Mode • SQLite fallback • No caching"
-
-CSV_PATH = "arcade_games_1978_2008_clean.csv"
-DB_PATH = "game_state.db"
-R2_PUBLIC_ROOT = "https://pub-04cb80aef9834a5d908ddf7538b7fffa.r2.dev"
+APP_VERSION = "1.7.4 • Restored No ROM / Not Playable flags + filters • Notes moved to Supabase-first • Marquee fallback restored • Collapsible research links • Collapsible ADB • Strict Cabinet Mode • SQLite fallback • CSV cached by mtime"
 
 STATUS_WANT = "want_to_play"
 STATUS_PLAYED = "played"
@@ -69,12 +66,8 @@ SUPABASE_KEY = _secret_or_env("SUPABASE_KEY", "") or _secret_or_env("SUPABASE_AN
 SUPABASE_ENABLED = bool(SUPABASE_URL and SUPABASE_KEY)
 
 
-def get_db() -> sqlite3.Connection:
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
-
-
 def init_db() -> None:
-    conn = get_db()
+    conn = core.get_db()
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS game_status (
@@ -144,14 +137,11 @@ def _sb_request(method: str, path: str, params: dict | None = None, payload=None
 
 
 def _sqlite_get_all_statuses() -> dict[str, str]:
-    conn = get_db()
-    cur = conn.execute("SELECT rom, status FROM game_status")
-    rows = cur.fetchall()
+    # Every writer strips and lowercases rom before inserting, so rows map straight to the cache
+    conn = core.get_db()
+    cur = conn.execute("SELECT rom, status FROM game_status WHERE rom != ''")
+    out = dict(cur.fetchall())
     conn.close()
-    out = {}
-    for rom, status in rows:
-        if rom:
-            out[str(rom).strip().lower()] = status
     return out
 
 
@@ -176,7 +166,7 @@ def get_all_statuses() -> dict[str, str]:
 
 
 def _sqlite_get_status(rom: str) -> str | None:
-    conn = get_db()
+    conn = core.get_db()
     cur = conn.execute("SELECT status FROM game_status WHERE rom=?", (rom,))
     row = cur.fetchone()
     conn.close()
@@ -201,7 +191,7 @@ def get_status(rom: str) -> str | None:
 
 
 def _sqlite_set_status(rom: str, status: str | None) -> None:
-    conn = get_db()
+    conn = core.get_db()
     if status is None:
         conn.execute("DELETE FROM game_status WHERE rom=?", (rom,))
     else:
@@ -245,7 +235,7 @@ def set_status(rom: str, status: str | None) -> None:
 
 
 def _sqlite_get_note(rom: str) -> str:
-    conn = get_db()
+    conn = core.get_db()
     cur = conn.execute("SELECT note FROM game_notes WHERE rom=?", (rom,))
     row = cur.fetchone()
     conn.close()
@@ -272,7 +262,7 @@ def get_note(rom: str) -> str:
 
 
 def _sqlite_set_note(rom: str, note: str) -> None:
-    conn = get_db()
+    conn = core.get_db()
     conn.execute(
         """
         INSERT INTO game_notes (rom, note, updated_at)
@@ -310,7 +300,7 @@ def set_note(rom: str, note: str) -> None:
 
 
 def _sqlite_get_all_flags() -> dict[str, dict[str, bool]]:
-    conn = get_db()
+    conn = core.get_db()
     cur = conn.execute("SELECT rom, no_rom, not_playable FROM game_flags")
     rows = cur.fetchall()
     conn.close()
@@ -352,7 +342,7 @@ def _sqlite_set_flag(rom: str, flag_name: str, enabled: bool) -> None:
     if not rom or flag_name not in (FLAG_NO_ROM, FLAG_NOT_PLAYABLE):
         return
     col = "no_rom" if flag_name == FLAG_NO_ROM else "not_playable"
-    conn = get_db()
+    conn = core.get_db()
     conn.execute(
         f"""
         INSERT INTO game_flags (rom, {col}, updated_at)
@@ -413,60 +403,8 @@ def set_flag(rom: str, flag_name: str, enabled: bool) -> None:
 
 
 # ----------------------------
-# Helpers: normalization / dataset
+# Session state
 # ----------------------------
-def normalize_str(x) -> str:
-    if pd.isna(x):
-        return ""
-    return str(x).strip()
-
-
-def ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
-    for col in ["rom", "game", "year", "company", "genre", "platform"]:
-        if col not in df.columns:
-            df[col] = ""
-
-    df["rom"] = df["rom"].map(normalize_str).str.lower()
-    df["game"] = df["game"].map(normalize_str)
-    df["company"] = df["company"].map(normalize_str)
-    df["genre"] = df["genre"].map(normalize_str)
-    df["platform"] = df["platform"].map(normalize_str)
-
-    df["year"] = pd.to_numeric(df["year"], errors="coerce")
-    df = df.dropna(subset=["game", "year"]).copy()
-    df["year"] = df["year"].astype(int)
-
-    df["_game_l"] = df["game"].astype(str).str.lower()
-    df["_genre_l"] = df["genre"].astype(str).str.lower()
-    df["_platform_l"] = df["platform"].astype(str).str.lower()
-    df["_company_l"] = df["company"].astype(str).str.lower()
-
-    return df
-
-
-def load_games_no_cache() -> pd.DataFrame:
-    df = pd.read_csv(CSV_PATH)
-    return ensure_columns(df)
-
-
-def build_links(game_name: str):
-    q = game_name.replace(" ", "+")
-    return {
-        "Gameplay (YouTube)": f"https://www.youtube.com/results?search_query={q}+arcade+gameplay",
-        "History / Legacy (search)": f"https://www.google.com/search?q={q}+arcade+history+legacy",
-        "Controls / Moves (search)": f"https://www.google.com/search?q={q}+arcade+controls+buttons",
-        "Manual / Instructions (search)": f"https://www.google.com/search?q={q}+arcade+manual+instructions",
-        "Ports / Collections (search)": f"https://www.google.com/search?q={q}+arcade+collection+port",
-    }
-
-
-def game_key(row: pd.Series) -> str:
-    rom = normalize_str(row.get("rom", "")).lower()
-    if rom:
-        return f"rom:{rom}"
-    return f"meta:{normalize_str(row.get('game', ''))}|{int(row.get('year', 0))}|{normalize_str(row.get('company', ''))}"
-
-
 def init_state():
     if "picked_rows" not in st.session_state:
         st.session_state.picked_rows = []
@@ -474,6 +412,8 @@ def init_state():
         st.session_state.selected_key = None
     if "adb_cache" not in st.session_state:
         st.session_state.adb_cache = {}
+    if "adb_loaded" not in st.session_state:
+        st.session_state.adb_loaded = {}
     if "status_cache" not in st.session_state:
         st.session_state.status_cache = {}
     if "status_cache_loaded" not in st.session_state:
@@ -482,71 +422,8 @@ def init_state():
         st.session_state.flag_cache = {}
     if "flag_cache_loaded" not in st.session_state:
         st.session_state.flag_cache_loaded = False
-    if "marquee_bytes_cache" not in st.session_state:
-        st.session_state.marquee_bytes_cache = {}
-
-
-# ----------------------------
-# Cabinet profile + strict compatibility
-# ----------------------------
-CABINET_SUMMARY = (
-    "Your cabinet: 4-way stick + 8-way stick, 6 buttons/player, NO spinner/trackball/lightgun/wheel, "
-    "horizontal monitor (vertical OK)."
-)
-
-BLOCKED_GENRE_EXACT = {
-    "trackball",
-    "dial/paddle",
-    "dial",
-    "paddle",
-    "lightgun shooter",
-    "gambling",
-    "casino",
-    "quiz",
-}
-
-BLOCKED_GENRE_CONTAINS = [
-    "driving",
-    "racing",
-    "pinball",
-    "redemption",
-]
-
-BLOCKED_TITLE_HINTS = [
-    "lightgun",
-    "light gun",
-    "trackball",
-    "spinner",
-    "steering",
-    "wheel",
-    "pedal",
-    "paddle",
-]
-
-
-def is_cabinet_compatible_strict(row: pd.Series) -> bool:
-    genre = normalize_str(row.get("genre", "")).strip().lower()
-    title = normalize_str(row.get("game", "")).strip().lower()
-    platform = normalize_str(row.get("platform", "")).strip().lower()
-
-    if not genre and not title:
-        return False
-
-    if genre in BLOCKED_GENRE_EXACT:
-        return False
-
-    for frag in BLOCKED_GENRE_CONTAINS:
-        if frag in genre:
-            return False
-
-    if any(x in platform for x in ("gambling", "casino", "slot", "quiz")):
-        return False
-
-    for hint in BLOCKED_TITLE_HINTS:
-        if hint in title:
-            return False
-
-    return True
+    if "marquee_exists_cache" not in st.session_state:
+        st.session_state.marquee_exists_cache = {}
 
 
 # ----------------------------
@@ -562,144 +439,22 @@ def _st_image(data, *, caption: str | None = None):
 # ----------------------------
 # Marquees (R2) - ROM image, fallback to default.png
 # ----------------------------
-def marquee_url(rom: str) -> str:
-    rom = (rom or "").strip().lower()
-    if not rom:
-        return f"{R2_PUBLIC_ROOT}/default.png"
-    return f"{R2_PUBLIC_ROOT}/{rom}.png"
-
-
-def default_marquee_url() -> str:
-    return f"{R2_PUBLIC_ROOT}/default.png"
-
-
-def fetch_image_bytes(url: str, timeout_sec: int = 10) -> bytes | None:
-    cache: dict = st.session_state.marquee_bytes_cache
-    if url in cache:
-        return cache[url]
-    try:
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0 (ArcadeGamePicker)"}, method="GET")
-        with urlopen(req, timeout=timeout_sec) as resp:
-            b = resp.read()
-        cache[url] = b
-        return b
-    except Exception:
-        cache[url] = None
-        return None
-
-
 def show_marquee(rom: str):
-    rom = (rom or "").strip().lower()
-
-    if rom:
-        b = fetch_image_bytes(marquee_url(rom), timeout_sec=10)
-        if b:
-            _st_image(b)
-            return
-
-    b2 = fetch_image_bytes(default_marquee_url(), timeout_sec=10)
-    if b2:
-        _st_image(b2)
+    src = core.marquee_src(rom, timeout_sec=10)
+    if src:
+        _st_image(src)
 
 
 # ----------------------------
 # ADB (ArcadeItalia) on-demand integration
 # ----------------------------
-def adb_urls(rom: str):
-    rom = (rom or "").strip().lower()
-    page_https = f"https://adb.arcadeitalia.net/?mame={rom}"
-    page_http = f"http://adb.arcadeitalia.net/?mame={rom}"
-
-    params = {"ajax": "query_mame", "lang": "en", "game_name": rom}
-    scraper_https = "https://adb.arcadeitalia.net/service_scraper.php?" + urlencode(params)
-    scraper_http = "http://adb.arcadeitalia.net/service_scraper.php?" + urlencode(params)
-    return {
-        "page_https": page_https,
-        "page_http": page_http,
-        "scraper_https": scraper_https,
-        "scraper_http": scraper_http,
-    }
-
-
-def fetch_json_url(url: str, timeout_sec: int = 12) -> dict:
-    req = Request(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (ArcadeGamePicker/1.7; +https://streamlit.app)",
-            "Accept": "application/json,text/plain,*/*",
-        },
-    )
-    with urlopen(req, timeout=timeout_sec) as resp:
-        raw = resp.read()
-    text = raw.decode("utf-8", errors="replace").strip()
-    data = json.loads(text)
-    if isinstance(data, dict):
-        return data
-    return {"_data": data}
-
-
-def fetch_adb_details(rom: str) -> dict:
-    rom = (rom or "").strip().lower()
-    if not rom:
-        return {"_error": "No ROM short name available for this game."}
-
-    if rom in st.session_state.adb_cache:
-        return st.session_state.adb_cache[rom]
-
-    urls = adb_urls(rom)
-    last_err = None
-    for u in (urls["scraper_https"], urls["scraper_http"]):
-        try:
-            data = fetch_json_url(u, timeout_sec=12)
-            st.session_state.adb_cache[rom] = data
-            return data
-        except Exception as e:
-            last_err = str(e)
-
-    out = {
-        "_error": "Could not retrieve data from ADB right now.",
-        "_detail": last_err or "Unknown error",
-        "_rom": rom,
-        "_fallback_page": urls["page_http"],
-    }
-    st.session_state.adb_cache[rom] = out
-    return out
-
-
-def extract_image_urls(obj) -> list[str]:
-    urls = []
-
-    def walk(x):
-        if isinstance(x, dict):
-            for v in x.values():
-                walk(v)
-        elif isinstance(x, list):
-            for v in x:
-                walk(v)
-        elif isinstance(x, str):
-            s = x.strip()
-            if s.startswith("http://") or s.startswith("https://"):
-                if re.search(r"\.(png|jpg|jpeg|webp)(\?.*)?$", s, re.IGNORECASE):
-                    urls.append(s)
-
-    walk(obj)
-
-    seen = set()
-    out = []
-    for u in urls:
-        if u not in seen:
-            seen.add(u)
-            out.append(u)
-    return out
-
-
 def show_adb_block(rom: str):
     rom = (rom or "").strip().lower()
     if not rom:
         st.info("ADB details require a ROM short name; this entry has none.")
         return None
 
-    urls = adb_urls(rom)
+    urls = core.adb_urls(rom)
     st.markdown("**ADB links:**")
     st.write(f"- ADB page (HTTPS): {urls['page_https']}")
     st.write(f"- ADB page (HTTP fallback): {urls['page_http']}")
@@ -712,17 +467,18 @@ def show_adb_block(rom: str):
     with c3:
         show_images = st.toggle("Show artwork/images (if provided)", value=True, key=f"adb_img_{rom}")
 
-    if refresh_btn and rom in st.session_state.adb_cache:
-        del st.session_state.adb_cache[rom]
+    if refresh_btn:
+        core.forget_adb_details(rom)
 
     if not load_btn and not refresh_btn:
-        if rom in st.session_state.adb_cache and not st.session_state.adb_cache[rom].get("_error"):
-            data = st.session_state.adb_cache[rom]
-        else:
+        # Prefetches keep the shared store warm, but details only show once loaded in this session
+        data = core.cached_adb_details(rom) if st.session_state.adb_loaded.get(rom) else None
+        if data is None or data.get("_error"):
             return None
     else:
+        st.session_state.adb_loaded[rom] = True
         with st.spinner("Fetching from ADB..."):
-            data = fetch_adb_details(rom)
+            data = core.fetch_adb_details(rom)
 
     if isinstance(data, dict) and data.get("_error"):
         st.error(data["_error"])
@@ -741,7 +497,7 @@ def show_adb_block(rom: str):
                 st.write(f"**{k}:** {val}")
 
     if show_images:
-        imgs = extract_image_urls(data)
+        imgs = core.extract_image_urls(data)
         if imgs:
             st.subheader("Artwork / Images")
             for u in imgs[:10]:
@@ -796,10 +552,6 @@ def flags_for_rom(rom: str) -> dict[str, bool]:
     }
 
 
-def flag_enabled(rom: str, flag_name: str) -> bool:
-    return bool(flags_for_rom(rom).get(flag_name, False))
-
-
 def update_flag(rom: str, flag_name: str, enabled: bool):
     rom = (rom or "").strip().lower()
     if not rom:
@@ -817,12 +569,12 @@ def update_flag(rom: str, flag_name: str, enabled: bool):
 # Details panel
 # ----------------------------
 def show_game_details(row: pd.Series):
-    g = normalize_str(row.get("game", ""))
-    y = int(row.get("year", 0))
-    c = normalize_str(row.get("company", ""))
-    genre = normalize_str(row.get("genre", ""))
-    platform = normalize_str(row.get("platform", ""))
-    rom = normalize_str(row.get("rom", "")).lower()
+    g = row["game"]
+    y = int(row["year"])
+    c = row["company"]
+    genre = row["genre"]
+    platform = row["platform"]
+    rom = row["rom"]
 
     show_marquee(rom)
 
@@ -834,7 +586,7 @@ def show_game_details(row: pd.Series):
     active_flags = [label for key, label in FLAG_LABELS.items() if cur_flags.get(key)]
     if active_flags:
         st.write(f"**Flags:** {' • '.join(active_flags)}")
-    st.caption(CABINET_SUMMARY)
+    st.caption(core.CABINET_SUMMARY)
 
     s1, s2, s3 = st.columns([1, 1, 1])
     with s1:
@@ -884,17 +636,18 @@ def show_game_details(row: pd.Series):
 
     with st.expander("📝 Notes", expanded=False):
         current_note = get_note(rom) if rom else ""
-        note_key = f"note_text_{rom or game_key(row)}"
+        note_id = rom or row["_key"]
+        note_key = f"note_text_{note_id}"
         if note_key not in st.session_state:
             st.session_state[note_key] = current_note
 
         uploaded = st.file_uploader(
             "Import notes (.txt, .md, .json)",
             type=["txt", "md", "json"],
-            key=f"note_upload_{rom or game_key(row)}",
+            key=f"note_upload_{note_id}",
             help="Upload a text-like file and paste it into the notes area.",
         )
-        append_import = st.toggle("Append imported text", value=False, key=f"note_append_{rom or game_key(row)}")
+        append_import = st.toggle("Append imported text", value=False, key=f"note_append_{note_id}")
         if uploaded is not None:
             try:
                 imported_text = uploaded.read().decode("utf-8", errors="replace")
@@ -911,27 +664,27 @@ def show_game_details(row: pd.Series):
             "Your notes",
             value=st.session_state[note_key],
             height=220,
-            key=f"note_editor_{rom or game_key(row)}",
+            key=f"note_editor_{note_id}",
             placeholder="Paste your research notes here...",
         )
 
         n1, n2 = st.columns(2)
         with n1:
-            if st.button("💾 Save notes", use_container_width=True, key=f"note_save_{rom or game_key(row)}"):
+            if st.button("💾 Save notes", use_container_width=True, key=f"note_save_{note_id}"):
                 if rom:
                     set_note(rom, st.session_state[note_key])
                     st.success("Notes saved." if not SUPABASE_ENABLED else "Notes saved (Supabase-first).")
                 else:
                     st.warning("Notes require a ROM short name for this entry.")
         with n2:
-            if st.button("🧽 Clear notes", use_container_width=True, key=f"note_clear_{rom or game_key(row)}"):
+            if st.button("🧽 Clear notes", use_container_width=True, key=f"note_clear_{note_id}"):
                 st.session_state[note_key] = ""
                 if rom:
                     set_note(rom, "")
                 st.rerun()
 
     with st.expander("🔗 Research links", expanded=False):
-        for name, url in build_links(g).items():
+        for name, url in core.build_links(g, search_labels=True):
             st.write(f"- {name}: {url}")
 
     with st.expander("📚 Arcade Database (ADB) details + artwork (on-demand)", expanded=False):
@@ -943,11 +696,13 @@ def show_game_details(row: pd.Series):
 # ----------------------------
 init_state()
 init_db()
+core.init_core_db()
 
 try:
-    df = load_games_no_cache()
+    csv_mtime = Path(core.CSV_PATH).stat().st_mtime
+    df = core.load_games(core.CSV_PATH, csv_mtime)
 except FileNotFoundError:
-    st.error(f"Could not find `{CSV_PATH}` in the repo root. Upload it to GitHub and redeploy.")
+    st.error(f"Could not find `{core.CSV_PATH}` in the repo root. Upload it to GitHub and redeploy.")
     st.stop()
 except Exception as e:
     st.error("Failed to load CSV.")
@@ -987,58 +742,45 @@ only_not_playable = st.sidebar.toggle("Show only ⛔ Not Playable", value=False)
 st.sidebar.markdown("---")
 st.sidebar.header("Filters")
 
-years = st.sidebar.slider("Year range", 1978, 2008, (1978, 2008))
-platforms = sorted(df["platform"].replace("", pd.NA).dropna().unique().tolist())
-genres = sorted(df["genre"].replace("", pd.NA).dropna().unique().tolist())
+platforms, genres, (year_lo, year_hi) = core.game_facets(csv_mtime)
+years = st.sidebar.slider("Year range", year_lo, year_hi, (year_lo, year_hi))
 
 platform_choice = st.sidebar.multiselect("Platform (optional)", platforms)
 genre_choice = st.sidebar.multiselect("Genre (optional)", genres)
 
 st.sidebar.markdown("---")
-try:
-    p = Path(CSV_PATH)
-    st.sidebar.caption(f"CSV rows: {len(df):,}")
-    st.sidebar.caption(f"CSV modified (server): {datetime.fromtimestamp(p.stat().st_mtime)}")
-except Exception:
-    pass
+st.sidebar.caption(f"CSV rows: {len(df):,}")
+st.sidebar.caption(f"CSV modified (server): {datetime.fromtimestamp(csv_mtime)}")
 
 
 # ----------------------------
 # Build filtered view
 # ----------------------------
-base = df[(df["year"] >= years[0]) & (df["year"] <= years[1])].copy()
+base = core.filter_games(csv_mtime, tuple(years), tuple(platform_choice), tuple(genre_choice), strict_mode)
 
-if platform_choice:
-    base = base[base["platform"].isin(platform_choice)]
-if genre_choice:
-    base = base[base["genre"].isin(genre_choice)]
 
-if strict_mode:
-    base = base[base.apply(is_cabinet_compatible_strict, axis=1)]
+# Status/flag filters: one dict lookup per row, then plain Boolean masks
+rom_col = base["rom"]
+status = rom_col.map(st.session_state.status_cache)
+flag_cache = st.session_state.flag_cache
+no_rom = rom_col.isin([r for r, f in flag_cache.items() if f.get(FLAG_NO_ROM)])
+not_playable = rom_col.isin([r for r, f in flag_cache.items() if f.get(FLAG_NOT_PLAYABLE)])
 
+keep = pd.Series(True, index=base.index)
+if only_want:
+    keep &= status.eq(STATUS_WANT)
+if hide_played:
+    keep &= status.ne(STATUS_PLAYED)
+if only_no_rom:
+    keep &= no_rom
+if hide_no_rom:
+    keep &= ~no_rom
+if only_not_playable:
+    keep &= not_playable
+if hide_not_playable:
+    keep &= ~not_playable
 
-def keep_by_status(row: pd.Series) -> bool:
-    rom = normalize_str(row.get("rom", "")).lower()
-    s = status_for_rom(rom)
-    if only_want and s != STATUS_WANT:
-        return False
-    if hide_played and s == STATUS_PLAYED:
-        return False
-
-    flags = flags_for_rom(rom)
-    if only_no_rom and not flags.get(FLAG_NO_ROM, False):
-        return False
-    if hide_no_rom and flags.get(FLAG_NO_ROM, False):
-        return False
-    if only_not_playable and not flags.get(FLAG_NOT_PLAYABLE, False):
-        return False
-    if hide_not_playable and flags.get(FLAG_NOT_PLAYABLE, False):
-        return False
-    return True
-
-
-base = base[base.apply(keep_by_status, axis=1)].copy()
-base = base.sort_values(["year", "game"]).reset_index(drop=True)
+base = base[keep].reset_index(drop=True)
 
 
 # ----------------------------
@@ -1049,12 +791,9 @@ search_name = st.text_input("Search by name or ROM (e.g., pacman, sf2, metal slu
 
 if search_name.strip():
     s = search_name.strip().lower()
-    hits = base[
-        base["_game_l"].str.contains(s, na=False)
-        | base["rom"].astype(str).str.lower().str.contains(s, na=False)
-    ].copy()
+    hits = base[base["_search_l"].str.contains(s, regex=False, na=False)]
 else:
-    hits = base.copy()
+    hits = base
 
 st.write(f"Matches: **{len(hits):,}**")
 st.divider()
@@ -1085,8 +824,8 @@ with left:
         if len(hits) == 0:
             st.warning("No games match your current strict cabinet + status filters. Widen filters.")
         else:
-            row = hits.sample(1).iloc[0]
-            st.session_state.selected_key = game_key(row)
+            row = hits.iloc[random.randrange(len(hits))]
+            st.session_state.selected_key = row["_key"]
             st.rerun()
 
     if pick_10:
@@ -1094,19 +833,22 @@ with left:
             st.warning("No games match your current strict cabinet + status filters. Widen filters.")
         else:
             n = min(10, len(hits))
-            sample = hits.sample(n).copy()
+            sample = hits.sample(n)
             st.session_state.picked_rows = sample.to_dict("records")
-            st.session_state.selected_key = game_key(pd.Series(st.session_state.picked_rows[0]))
+            core.prefetch_adb_details([r["rom"] for r in st.session_state.picked_rows])
+            core.prefetch_marquees([r["rom"] for r in st.session_state.picked_rows])
+            st.session_state.selected_key = st.session_state.picked_rows[0]["_key"]
             st.rerun()
 
     st.markdown("### 📆 Game of the Day")
     now = datetime.now(TZ)
-    seed = int(now.strftime("%Y")) * 1000 + int(now.strftime("%j"))
-    if len(hits) > 0:
-        gotd = hits.iloc[seed % len(hits)]
+    seed = now.year * 1000 + now.timetuple().tm_yday
+    # Drawn from the filtered catalog before the name/ROM search, so typing doesn't change it
+    if len(base) > 0:
+        gotd = base.iloc[seed % len(base)]
         st.caption(f"Today: {gotd['game']} ({gotd['year']})")
         if st.button("Open Game of the Day", use_container_width=True):
-            st.session_state.selected_key = game_key(gotd)
+            st.session_state.selected_key = gotd["_key"]
             st.rerun()
     else:
         st.caption("No Game of the Day with current filters.")
@@ -1114,49 +856,47 @@ with left:
     st.markdown("---")
     st.markdown("## 📜 Browse list")
 
-    view = hits[["rom", "game", "year", "company", "genre", "platform"]].copy()
-    view["status"] = view["rom"].apply(lambda r: STATUS_LABELS.get(status_for_rom(str(r).lower()), "—"))
-    view["flags"] = view["rom"].apply(
-        lambda r: " • ".join([label for key, label in FLAG_LABELS.items() if flag_enabled(str(r).lower(), key)]) or "—"
-    )
-
-    st.dataframe(view, use_container_width=True, height=420)
+    view = hits
+    status_cache = st.session_state.status_cache
+
+    # The grid only gets the first rows unless asked, so status/flags are only computed for those
+    grid_limit = 1000
+    show_all = len(view) > grid_limit and st.toggle(f"Show all {len(view):,} results", key="grid_show_all")
+    grid = (view if show_all else view.head(grid_limit))[["rom", "game", "year", "company", "genre", "platform"]].copy()
+    status_labels = {rom: STATUS_LABELS.get(s, "—") for rom, s in status_cache.items()}
+    flag_labels = {
+        rom: " • ".join(label for key, label in FLAG_LABELS.items() if f.get(key))
+        for rom, f in st.session_state.flag_cache.items()
+    }
+    grid["status"] = grid["rom"].map(status_labels).fillna("—")
+    grid["flags"] = grid["rom"].map(flag_labels).replace("", "—").fillna("—")
+    st.dataframe(grid, use_container_width=True, height=420)
+    if len(view) > len(grid):
+        st.caption(f"Showing the first {grid_limit:,} of {len(view):,} — search or filter to narrow down, or show all.")
 
     st.markdown("### Select a game")
     if len(view) == 0:
         st.info("No results to select. Adjust filters.")
     else:
-        labels = (
-            view["game"].astype(str)
-            + " — "
-            + view["year"].astype(str)
-            + " — "
-            + view["company"].astype(str)
-            + " — "
-            + view["status"].astype(str)
+        labels, roms = view["_label"], view["rom"]
+        sel_pos = st.selectbox(
+            "Pick from results", range(len(view)),
+            format_func=lambda i: f"{labels.iat[i]} — {STATUS_LABELS.get(status_cache.get(roms.iat[i]), '—')}",
+            key="browse_select",
         )
-        selected_label = st.selectbox("Pick from results", labels, key="browse_select")
-        idx = labels[labels == selected_label].index[0]
-        selected_row = view.loc[idx]
+        selected_row = view.iloc[sel_pos]
 
         if st.button("➡️ Open selected", use_container_width=True):
-            st.session_state.selected_key = game_key(selected_row)
+            st.session_state.selected_key = selected_row["_key"]
             st.rerun()
 
     if st.session_state.picked_rows:
         st.markdown("---")
         st.markdown("## 🎯 Your 10 picks")
-        pick_df = pd.DataFrame(st.session_state.picked_rows)
-        pick_df = pick_df[["rom", "game", "year", "company", "genre", "platform"]].copy()
-        pick_df["status"] = pick_df["rom"].apply(lambda r: STATUS_LABELS.get(status_for_rom(str(r).lower()), "—"))
-        pick_df["flags"] = pick_df["rom"].apply(
-            lambda r: " • ".join([label for key, label in FLAG_LABELS.items() if flag_enabled(str(r).lower(), key)]) or "—"
-        )
-
-        for i, r in pick_df.iterrows():
-            label = f"{r['game']} ({int(r['year'])}) — {r['status']}"
+        for i, r in enumerate(st.session_state.picked_rows):
+            label = f"{r['game']} ({int(r['year'])}) — {STATUS_LABELS.get(status_for_rom(r['rom']), '—')}"
             if st.button(label, key=f"pick_{i}", use_container_width=True):
-                st.session_state.selected_key = game_key(r)
+                st.session_state.selected_key = r["_key"]
                 st.rerun()
 
 with right:
@@ -1164,24 +904,8 @@ with right:
     if not st.session_state.selected_key:
         st.info("Pick a game from the list or hit Random/10 Picks to see details.")
     else:
-        key = st.session_state.selected_key
-
-        if key.startswith("rom:"):
-            rom = key.split("rom:", 1)[1]
-            match = df[df["rom"] == rom]
-            if len(match) == 0:
-                st.warning("Selected game not found in dataset.")
-            else:
-                show_game_details(match.iloc[0])
+        pos = core.game_index(csv_mtime).get(st.session_state.selected_key)
+        if pos is None:
+            st.warning("Selected game not found in dataset.")
         else:
-            try:
-                _, meta = key.split("meta:", 1)
-                title, year_str, company = meta.split("|", 2)
-                year = int(year_str)
-                match = df[(df["game"] == title) & (df["year"] == year) & (df["company"] == company)]
-                if len(match) == 0:
-                    st.warning("Selected game not found in dataset.")
-                else:
-                    show_game_details(match.iloc[0])
-            except Exception:
-                st.warning("Could not resolve selection key.")
+            show_game_details(df.iloc[pos])
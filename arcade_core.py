@@ -0,0 +1,536 @@
+# ============================
+# Arcade Game Picker — shared core
+# Catalog, lookups and fetch helpers used by app.py and app_gpt.py. Cached helpers here
+# are shared by the whole process, whichever entrypoint is running.
+# ============================
+import hashlib
+import io
+import json
+import re
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlencode, quote_plus, urlsplit
+
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+
+# ----------------------------
+# Constants / Config
+# ----------------------------
+CSV_PATH = "arcade_games_1978_2008_clean.csv"
+CATALOG_VERSION = 9  # bump when the normalized catalog (columns, order, dtypes) changes
+CSV_DTYPES = {c: "string[pyarrow]" for c in ("rom", "game", "company", "genre", "platform")}
+FACET_COLS = ("company", "genre", "platform", "_company_l", "_genre_l", "_platform_l")  # stored as category
+DB_PATH = "game_state.db"
+
+R2_PUBLIC_ROOT = "https://pub-04cb80aef9834a5d908ddf7538b7fffa.r2.dev"
+URL_PROBE_TTL_DAYS = 30   # marquee found: R2 objects rarely disappear
+URL_MISS_TTL_SEC = 3600   # marquee missing: re-probe hourly so new uploads show up
+ADB_CACHE_TTL_DAYS = 7
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+
+# ----------------------------
+# Cabinet profile + strict compatibility
+# ----------------------------
+CABINET_SUMMARY = (
+    "Your cabinet: 4-way stick + 8-way stick, 6 buttons/player, NO spinner/trackball/lightgun/wheel, "
+    "horizontal monitor (vertical OK)."
+)
+
+BLOCKED_GENRE_EXACT = {
+    "trackball", "dial/paddle", "dial", "paddle",
+    "lightgun shooter", "gambling", "casino", "quiz",
+}
+BLOCKED_GENRE_CONTAINS = ["driving", "racing", "pinball", "redemption"]
+BLOCKED_TITLE_HINTS = [
+    "lightgun", "light gun", "trackball", "spinner",
+    "steering", "wheel", "pedal", "paddle",
+]
+BLOCKED_PLATFORM_HINTS = ("gambling", "casino", "slot", "quiz")
+
+# ----------------------------
+# Catalog
+# ----------------------------
+def normalize_str(x) -> str:
+    if pd.isna(x):
+        return ""
+    return str(x).strip()
+
+def ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
+    for col in ["rom", "game", "year", "company", "genre", "platform"]:
+        if col not in df.columns:
+            df[col] = ""
+    for col in ["rom", "game", "company", "genre", "platform"]:
+        df[col] = df[col].astype("string[pyarrow]").fillna("").str.strip()
+    df["rom"]      = df["rom"].str.lower()
+    df["year"]     = pd.to_numeric(df["year"], errors="coerce")
+    df = df.dropna(subset=["game", "year"]).copy()
+    df["year"]     = df["year"].astype("int16")
+    meta_key = "meta:" + df["game"] + "|" + df["year"].astype(str) + "|" + df["company"]
+    df["_key"]     = ("rom:" + df["rom"]).where(df["rom"] != "", meta_key)
+    df["_game_l"]     = df["game"].str.lower()
+    df["_genre_l"]    = df["genre"].str.lower()
+    df["_platform_l"] = df["platform"].str.lower()
+    df["_company_l"]  = df["company"].str.lower()
+    # Static part of the "pick from results" label; the status is appended at render time
+    df["_label"]      = df["game"] + " — " + df["year"].astype(str) + " — " + df["company"]
+    # One haystack for the name/ROM search boxes (tab keeps fields from matching across)
+    df["_search_l"]   = df["_game_l"] + "\t" + df["rom"]
+    df["_cab_ok"]     = cabinet_compatible_mask(df)
+    # Low-cardinality facets; everything string-built from them is done above
+    return as_facet_categories(df)
+
+def as_facet_categories(df: pd.DataFrame) -> pd.DataFrame:
+    # Shared by the CSV and Parquet paths so both give categories backed by string[pyarrow]
+    for col in FACET_COLS:
+        df[col] = df[col].astype("string[pyarrow]").astype("category")
+    return df
+
+@st.cache_resource(show_spinner=False)
+def load_games(csv_path: str, mtime: float) -> pd.DataFrame:
+    # One frame shared by every session and returned without a per-call copy, so treat it as
+    # read-only (filters build new frames via masks/iloc).
+    # mtime is part of the cache key so a new CSV still applies immediately.
+    # The normalized frame is kept in a Parquet sidecar so cold starts skip CSV parsing.
+    # Its name carries the source CSV's exact mtime and size: a CSV swapped in with an
+    # older mtime (cp -p, rsync -a, unpacked archives) still gets a fresh parse.
+    src = Path(csv_path)
+    st_src = src.stat()
+    parquet = src.with_suffix(f".v{CATALOG_VERSION}.{st_src.st_mtime_ns}-{st_src.st_size}.parquet")
+    if parquet.exists():
+        try:
+            cached = pd.read_parquet(parquet)
+            # Parquet round-trips "string" without its storage, and categories come back as
+            # object; put the Arrow backing back on both so warm and cold loads match exactly
+            cached = cached.astype({c: "string[pyarrow]" for c in cached.columns if cached[c].dtype == "string"})
+            return as_facet_categories(cached)
+        except Exception:
+            pass
+    df = ensure_columns(pd.read_csv(csv_path, engine="pyarrow", dtype=CSV_DTYPES))
+    # Presorted once; boolean filtering downstream preserves this order
+    df = df.sort_values(["year", "game"]).reset_index(drop=True)
+    try:
+        # Write then rename, so a concurrent cold start never reads a half-written sidecar
+        tmp = parquet.with_name(parquet.name + ".tmp")
+        df.to_parquet(tmp, index=False, compression="zstd")
+        tmp.replace(parquet)
+        for stale in src.parent.glob(f"{src.stem}.v*.parquet"):
+            if stale != parquet:
+                stale.unlink(missing_ok=True)
+    except Exception:
+        pass
+    return df
+
+def is_cabinet_compatible_strict(row: pd.Series) -> bool:
+    genre    = normalize_str(row.get("genre", "")).strip().lower()
+    title    = normalize_str(row.get("game", "")).strip().lower()
+    platform = normalize_str(row.get("platform", "")).strip().lower()
+    if not genre and not title:
+        return False
+    if genre in BLOCKED_GENRE_EXACT:
+        return False
+    for frag in BLOCKED_GENRE_CONTAINS:
+        if frag in genre:
+            return False
+    if any(x in platform for x in BLOCKED_PLATFORM_HINTS):
+        return False
+    for hint in BLOCKED_TITLE_HINTS:
+        if hint in title:
+            return False
+    return True
+
+def cabinet_compatible_mask(df: pd.DataFrame) -> pd.Series:
+    # Vectorized is_cabinet_compatible_strict over the lowercase mirrors
+    genre, title, platform = df["_genre_l"], df["_game_l"], df["_platform_l"]
+    def any_of(col: pd.Series, words) -> pd.Series:
+        return col.str.contains("|".join(map(re.escape, words)), regex=True, na=False)
+    return (
+        ((genre != "") | (title != ""))
+        & ~genre.isin(BLOCKED_GENRE_EXACT)
+        & ~any_of(genre, BLOCKED_GENRE_CONTAINS)
+        & ~any_of(platform, BLOCKED_PLATFORM_HINTS)
+        & ~any_of(title, BLOCKED_TITLE_HINTS)
+    )
+
+@st.cache_data(show_spinner=False)
+def game_facets(csv_mtime: float) -> tuple[list[str], list[str], tuple[int, int]]:
+    # Sidebar choices: platforms, genres and the (min, max) year for the slider
+    df = load_games(CSV_PATH, csv_mtime)
+    # Categories are the sorted unique values already
+    platforms = [p for p in df["platform"].cat.categories if p]
+    genres    = [g for g in df["genre"].cat.categories if g]
+    return platforms, genres, (int(df["year"].min()), int(df["year"].max()))
+
+@st.cache_resource(show_spinner=False)
+def game_index(csv_mtime: float) -> dict[str, int]:
+    # _key -> row position in load_games(); shared read-only across sessions
+    # Duplicate keys resolve to their first row, as a mask scan would
+    df = load_games(CSV_PATH, csv_mtime)
+    first = ~df["_key"].duplicated().to_numpy()
+    return dict(zip(df["_key"].to_numpy()[first].tolist(), np.flatnonzero(first).tolist()))
+
+def filter_games(csv_mtime: float, years: tuple[int, int], platforms: tuple[str, ...],
+                 genres: tuple[str, ...], strict: bool) -> pd.DataFrame:
+    # Session-independent filters only; status filters depend on the user's cache.
+    # Not cached: the numpy mask + iloc is cheaper than unpickling a cached frame,
+    # and every slider/multiselect combination would otherwise stay resident.
+    df = load_games(CSV_PATH, csv_mtime)
+    year = df["year"].to_numpy()
+    mask = (year >= years[0]) & (year <= years[1])
+    if platforms:
+        mask &= df["platform"].isin(platforms).to_numpy()
+    if genres:
+        mask &= df["genre"].isin(genres).to_numpy()
+    if strict:
+        mask &= df["_cab_ok"].to_numpy()
+    return df.iloc[np.flatnonzero(mask)]
+
+# ----------------------------
+# SQLite
+# ----------------------------
+def get_db() -> sqlite3.Connection:
+    # Short-lived per call; with WAL, synchronous=NORMAL means a commit doesn't fsync
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def init_core_db() -> None:
+    conn = get_db()
+    conn.execute("PRAGMA journal_mode=WAL")  # persistent: stored in the database file
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS url_probe (
+            url TEXT PRIMARY KEY,
+            ok INTEGER,
+            checked_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS adb_cache (
+            rom TEXT PRIMARY KEY,
+            data TEXT,
+            fetched_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+    conn.commit()
+    conn.close()
+
+def sqlite_get_url_probes(urls: list[str] | None = None) -> dict[str, tuple[float, bool]]:
+    # Fresh hits only, as url -> (checked_at epoch, True); misses are never trusted from disk.
+    # urls=None loads every fresh row
+    if urls is not None and not urls:
+        return {}
+    where = "" if urls is None else f"url IN ({','.join('?' * len(urls))}) AND "
+    conn = get_db()
+    cur = conn.execute(
+        f"SELECT url, CAST(strftime('%s', checked_at) AS REAL) FROM url_probe "
+        f"WHERE {where}ok = 1 AND checked_at > datetime('now', ?)",
+        (*(urls or ()), f"-{URL_PROBE_TTL_DAYS} days"),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return {url: (checked_at, True) for url, checked_at in rows}
+
+def sqlite_set_url_probes(results: dict[str, bool]) -> None:
+    if not results:
+        return
+    conn = get_db()
+    conn.executemany("""
+        INSERT INTO url_probe (url, ok, checked_at)
+        VALUES (?, ?, datetime('now'))
+        ON CONFLICT(url) DO UPDATE SET ok=excluded.ok, checked_at=datetime('now')
+    """, [(url, int(ok)) for url, ok in results.items()])
+    conn.commit()
+    conn.close()
+
+def sqlite_get_adb(rom: str) -> dict | None:
+    conn = get_db()
+    cur = conn.execute(
+        "SELECT data FROM adb_cache WHERE rom = ? AND fetched_at > datetime('now', ?)",
+        (rom, f"-{ADB_CACHE_TTL_DAYS} days"),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return json.loads(row[0]) if row else None
+
+def sqlite_set_adb(rom: str, data: dict) -> None:
+    conn = get_db()
+    conn.execute("""
+        INSERT INTO adb_cache (rom, data, fetched_at)
+        VALUES (?, ?, datetime('now'))
+        ON CONFLICT(rom) DO UPDATE SET data=excluded.data, fetched_at=datetime('now')
+    """, (rom, json.dumps(data)))
+    conn.commit()
+    conn.close()
+
+def sqlite_delete_adb(rom: str) -> None:
+    conn = get_db()
+    conn.execute("DELETE FROM adb_cache WHERE rom = ?", (rom,))
+    conn.commit()
+    conn.close()
+
+# ----------------------------
+# Links / keys
+# ----------------------------
+@lru_cache(maxsize=2048)
+def build_links(game_name: str, search_labels: bool = False) -> tuple[tuple[str, str], ...]:
+    # search_labels keeps app_gpt's "(search)" suffix on the last two links
+    q = quote_plus(game_name)
+    tag = " (search)" if search_labels else ""
+    return (
+        ("Gameplay (YouTube)",         f"https://www.youtube.com/results?search_query={q}+arcade+gameplay"),
+        ("History / Legacy (search)",  f"https://www.google.com/search?q={q}+arcade+history+legacy"),
+        ("Controls / Moves (search)",  f"https://www.google.com/search?q={q}+arcade+controls+buttons"),
+        (f"Manual / Instructions{tag}", f"https://www.google.com/search?q={q}+arcade+manual+instructions"),
+        (f"Ports / Collections{tag}",   f"https://www.google.com/search?q={q}+arcade+collection+port"),
+    )
+
+def short_key(key: str) -> str:
+    # Fixed-length stand-in for long meta: keys in widget keys
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+# ----------------------------
+# Marquees (R2)
+# ----------------------------
+def marquee_url(rom: str) -> str:
+    rom = (rom or "").strip().lower()
+    if not rom:
+        return f"{R2_PUBLIC_ROOT}/default.png"
+    return f"{R2_PUBLIC_ROOT}/{rom}.png"
+
+def default_marquee_url() -> str:
+    return f"{R2_PUBLIC_ROOT}/default.png"
+
+# host -> "GET" once that host has answered HEAD with 405/501
+_PROBE_METHOD: dict[str, str] = {}
+
+def _probe(session: requests.Session, url: str, timeout_sec: int) -> bool | None:
+    # No Streamlit calls in here: it runs on worker threads.
+    # None means the host couldn't be reached, which says nothing about the file.
+    host = urlsplit(url).netloc
+    method = _PROBE_METHOD.get(host, "HEAD")
+    headers = {"Range": "bytes=0-0"} if method == "GET" else None
+    try:
+        resp = session.request(method, url, headers=headers, timeout=timeout_sec, allow_redirects=True)
+    except requests.RequestException:
+        return None
+    if method == "HEAD" and resp.status_code in (405, 501):
+        _PROBE_METHOD[host] = "GET"
+        return _probe(session, url, timeout_sec)
+    return 200 <= resp.status_code < 400
+
+@st.cache_resource(show_spinner=False)
+def http_session() -> requests.Session:
+    # Keep-alive connections shared by every session in the process
+    session = requests.Session()
+    session.headers["User-Agent"] = "Mozilla/5.0 (ArcadeGamePicker)"
+    return session
+
+@st.cache_resource(show_spinner=False)
+def _probe_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="probe")
+
+@st.cache_resource(show_spinner=False)
+def _url_exists_cache() -> dict[str, tuple[float, bool]]:
+    # Definite probe answers as url -> (checked_at, ok), shared by every session in the process.
+    # Seeded with every fresh url_probe hit in one query; entries keep their stored checked_at,
+    # so _probe_fresh expires them on the original schedule.
+    return sqlite_get_url_probes()
+
+def _probe_fresh(entry: tuple[float, bool] | None) -> bool:
+    if entry is None:
+        return False
+    checked_at, ok = entry
+    ttl = URL_PROBE_TTL_DAYS * 86400 if ok else URL_MISS_TTL_SEC
+    return time.time() - checked_at < ttl
+
+def _probe_and_record(session: requests.Session, url: str, timeout_sec: int, shared: dict) -> bool | None:
+    # No Streamlit calls in here: it runs on worker threads.
+    # A miss overwrites any stored hit, but sqlite_get_url_probes never reads misses back,
+    # so they only live in memory for URL_MISS_TTL_SEC.
+    ok = _probe(session, url, timeout_sec)
+    if ok is not None:
+        shared[url] = (time.time(), ok)
+        try:
+            sqlite_set_url_probes({url: ok})
+        except sqlite3.Error:
+            pass  # shared already has the answer; a locked or read-only DB mustn't fail the probe
+    return ok
+
+@st.cache_resource(show_spinner=False)
+def _probes_in_flight() -> dict[str, Future]:
+    return {}
+
+def _submit_probes(urls: list[str], timeout_sec: int) -> dict[str, Future]:
+    # One probe per URL at a time; a click reuses a background prefetch's future instead of
+    # queueing a second request behind it.
+    shared, inflight = _url_exists_cache(), _probes_in_flight()
+    session, pool = http_session(), _probe_pool()
+    out = {}
+    for u in urls:
+        fut = inflight.get(u)
+        if fut is None:
+            fut = pool.submit(_probe_and_record, session, u, timeout_sec, shared)
+            inflight[u] = fut
+            fut.add_done_callback(lambda _f, u=u: inflight.pop(u, None))
+        out[u] = fut
+    return out
+
+def images_exist(urls: list[str], timeout_sec: int = 10) -> dict[str, bool | None]:
+    # Process cache first, then the url_probe table (survives restarts), then the network.
+    # Unreachable results (None) are only remembered in this session's marquee_exists_cache,
+    # so they're retried by the next session.
+    shared = _url_exists_cache()
+    failed: dict = st.session_state.marquee_exists_cache
+    missing = [u for u in dict.fromkeys(urls) if not _probe_fresh(shared.get(u)) and u not in failed]
+    if missing:
+        shared.update(sqlite_get_url_probes(missing))
+        missing = [u for u in missing if not _probe_fresh(shared.get(u))]
+    if missing:
+        for url, fut in _submit_probes(missing, timeout_sec).items():
+            # The future may belong to a background prefetch, so a probe that raised is just
+            # unreachable here rather than an exception in this render
+            if fut.exception() is not None or fut.result() is None:
+                failed[url] = None
+    return {u: None if u in failed else shared[u][1] for u in urls}
+
+def marquee_src(rom: str, timeout_sec: int = 10) -> str | None:
+    # URL for st.image to hand to the browser: the ROM marquee, else default.png.
+    # Both are probed together, so a miss costs one round-trip.
+    rom_url, default_url = marquee_url(rom), default_marquee_url()
+    found = images_exist([rom_url, default_url], timeout_sec)
+    if found[rom_url]:
+        return rom_url
+    return default_url if found[default_url] else None
+
+def prefetch_marquees(roms: list[str], timeout_sec: int = 10) -> None:
+    # Fire-and-forget probes for a whole pick list, like prefetch_adb_details. Results land in
+    # the shared cache; unreachable answers are dropped and retried when the marquee renders.
+    shared = _url_exists_cache()
+    urls = [marquee_url(r) for r in roms if r] + [default_marquee_url()]
+    stale = [u for u in dict.fromkeys(urls) if not _probe_fresh(shared.get(u))]
+    if stale:
+        shared.update(sqlite_get_url_probes(stale))
+        _submit_probes([u for u in stale if not _probe_fresh(shared.get(u))], timeout_sec)
+
+# ----------------------------
+# ADB integration
+# ----------------------------
+def adb_urls(rom: str):
+    rom = (rom or "").strip().lower()
+    query = urlencode({"ajax": "query_mame", "lang": "en", "game_name": rom})
+    return {
+        "page_https":    f"https://adb.arcadeitalia.net/?mame={rom}",
+        "page_http":     f"http://adb.arcadeitalia.net/?mame={rom}",
+        "scraper_https": f"https://adb.arcadeitalia.net/service_scraper.php?{query}",
+        "scraper_http":  f"http://adb.arcadeitalia.net/service_scraper.php?{query}",
+    }
+
+def fetch_json_url(session: requests.Session, url: str, timeout_sec: int = 12) -> dict:
+    # Goes through the shared keep-alive session; requests already asks for gzip.
+    headers = {"Accept": "application/json,text/plain,*/*"}
+    with session.get(url, headers=headers, timeout=timeout_sec, stream=True) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        data = json.load(io.TextIOWrapper(resp.raw, encoding="utf-8", errors="replace"))
+    return data if isinstance(data, dict) else {"_data": data}
+
+@st.cache_resource(show_spinner=False)
+def _adb_store() -> dict[str, tuple[float, dict]]:
+    # Successful ADB responses, shared by every session in the process
+    return {}
+
+@st.cache_resource(show_spinner=False)
+def _adb_pool() -> ThreadPoolExecutor:
+    # Separate from _probe_pool so a slow ADB prefetch never holds up marquee probes
+    return ThreadPoolExecutor(max_workers=10, thread_name_prefix="adb")
+
+def _adb_fresh(store: dict, rom: str) -> dict | None:
+    hit = store.get(rom)
+    if hit and time.time() - hit[0] < ADB_CACHE_TTL_DAYS * 86400:
+        return hit[1]
+    return None
+
+def cached_adb_details(rom: str) -> dict | None:
+    # Shared successes first; errors are only remembered in this session's adb_cache
+    data = _adb_fresh(_adb_store(), rom)
+    return data if data is not None else st.session_state.adb_cache.get(rom)
+
+def forget_adb_details(rom: str) -> None:
+    _adb_store().pop(rom, None)
+    st.session_state.adb_cache.pop(rom, None)
+    sqlite_delete_adb(rom)
+
+def fetch_adb_details(rom: str) -> dict:
+    rom = (rom or "").strip().lower()
+    if not rom:
+        return {"_error": "No ROM short name available for this game."}
+    cached = cached_adb_details(rom)
+    if cached is not None:
+        return cached
+    data = _fetch_adb_remote(rom, _adb_store(), http_session())
+    if data.get("_error"):
+        st.session_state.adb_cache[rom] = data
+    return data
+
+def _fetch_adb_remote(rom: str, store: dict, session: requests.Session) -> dict:
+    # No Streamlit calls in here: prefetch_adb_details runs it on worker threads.
+    # The adb_cache table survives restarts, so it's checked before the network.
+    data = sqlite_get_adb(rom)
+    if data is not None:
+        store[rom] = (time.time(), data)
+        return data
+    urls = adb_urls(rom)
+    last_err = None
+    for u in (urls["scraper_https"], urls["scraper_http"]):
+        try:
+            data = fetch_json_url(session, u, timeout_sec=12)
+        except Exception as e:
+            last_err = str(e)
+            continue
+        store[rom] = (time.time(), data)
+        try:
+            sqlite_set_adb(rom, data)
+        except sqlite3.Error:
+            pass  # store already has the data; a failed cache write is not a failed fetch
+        return data
+    return {
+        "_error": "Could not retrieve data from ADB right now.",
+        "_detail": last_err or "Unknown error",
+        "_rom": rom,
+        "_fallback_page": urls["page_http"],
+    }
+
+def prefetch_adb_details(roms: list[str]) -> None:
+    # Fire-and-forget warm-up of _adb_store; failures are dropped and retried on click.
+    store, pool, session = _adb_store(), _adb_pool(), http_session()
+    for rom in dict.fromkeys(r for r in roms if r):
+        if _adb_fresh(store, rom) is None:
+            pool.submit(_fetch_adb_remote, rom, store, session)
+
+def extract_image_urls(obj) -> list[str]:
+    # Iterative walk; children are pushed reversed so URLs come out in document order.
+    stack = [obj]
+    seen: set[str] = set()
+    out: list[str] = []
+    while stack:
+        x = stack.pop()
+        t = type(x)  # json.load only builds exact dict/list/str, so no isinstance needed
+        if t is dict:
+            stack.extend(reversed(list(x.values())))
+        elif t is list:
+            stack.extend(reversed(x))
+        elif t is str:
+            s = x.strip()
+            if not s.startswith(("http://", "https://")) or s in seen:
+                continue
+            # Same matches as the old r"\.(png|jpg|jpeg|webp)(\?.*)?$": the extension ends the URL
+            # (so "a.php?img=b.png" counts) or sits right before any "?".
+            low = s.lower()
+            if low.endswith(IMAGE_EXTS) or any(p.endswith(IMAGE_EXTS) for p in low.split("?")[:-1]):
+                seen.add(s); out.append(s)
+    return out